@@ -1,25 +1,35 @@
 
 import streamlit as st
-import matplotlib.pyplot as plt
 import pandas as pd
-import numpy as np
-import json
+import io
 import uuid
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 from typing import Optional
-from property_sim_refactor import PropertySim
-from auto_sim import AutoSim, create_down_payment_plot
+from property_sim_refactor import FINANCING_FIELDS, PropertySim
+from auto_sim import AutoSim
 import sim_db
 
-DB_PATH = str(Path(__file__).resolve().parent / "simdb.sqlite")
-MAPS_DIR = Path(__file__).resolve().parent / "property_maps"
-
-sim_db.init_db(DB_PATH)
-MAPS_DIR.mkdir(parents=True, exist_ok=True)
+_HERE = Path(__file__).resolve().parent
+DB_PATH = str(_HERE / "simdb.sqlite")
+MAPS_DIR = _HERE / "property_maps"
+RUNS_DIR = _HERE / "runs"
 
 st.set_page_config(page_title="Property Simulator", layout="wide")
 
 
+@st.cache_resource
+def _init_storage() -> None:
+    """Create the schema and output folders once per process instead of on every rerun."""
+    sim_db.init_db(DB_PATH)
+    MAPS_DIR.mkdir(parents=True, exist_ok=True)
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+_init_storage()
+
+
 def _remove_map_if_exists(path: Optional[str]) -> None:
     if not path:
         return
@@ -43,6 +53,8 @@ def create_property_map_image(
         _remove_map_if_exists(existing_path)
         return None
 
+    import matplotlib.pyplot as plt
+
     MAPS_DIR.mkdir(parents=True, exist_ok=True)
     filename = f"property_{uuid.uuid4().hex}.png"
     output_path = MAPS_DIR / filename
@@ -67,6 +79,181 @@ def create_property_map_image(
 
     return str(output_path)
 
+
+# Cached read path: every widget interaction reruns the script, so the page's
+# reads are loaded together, memoized, and cleared explicitly after each write.
+@st.cache_data(ttl=60)
+def _load_sidebar_state(db_path: str, property_id: Optional[int], scenario_id: Optional[int]) -> dict:
+    return sim_db.load_sidebar_state(db_path, property_id, scenario_id)
+
+
+def _sidebar_state() -> dict:
+    return _load_sidebar_state(
+        DB_PATH, st.session_state.selected_property_id, st.session_state.selected_scenario_id
+    )
+
+
+# Scenario assumption columns: (param key, label, default, min, max, step)
+SCENARIO_COLUMNS = {
+    "long_term": [
+        ("monthly_rent", "Monthly rent ($)", 2200.0, 0.0, None, 50.0),
+        ("rent_growth_percent_per_year", "Rent growth per year (%)", 2.0, 0.0, 15.0, 0.5),
+        ("vacancy_percent", "Vacancy (%)", 5.0, 0.0, 30.0, 0.5),
+    ],
+    "short_term": [
+        ("nightly_rate", "Nightly rate ($)", 150.0, 0.0, None, 10.0),
+        ("occupancy_percent", "Occupancy rate (%)", 65.0, 0.0, 100.0, 1.0),
+        ("cleaning_fee_per_stay", "Cleaning fee per stay ($)", 100.0, 0.0, None, 10.0),
+        ("avg_stay_length_nights", "Average stay length (nights)", 3.0, 1.0, None, 0.5),
+        ("platform_fee_percent", "Platform fees (%)", 15.0, 0.0, 30.0, 0.5),
+        ("rent_growth_percent_per_year", "Rate growth per year (%)", 3.0, 0.0, 15.0, 0.5),
+    ],
+    "common": [
+        ("tax_percent_of_price_per_year", "Property tax (%)", 1.2, 0.0, 3.0, 0.1),
+        ("insurance_percent_of_price_per_year", "Insurance (%)", 0.6, 0.0, 3.0, 0.1),
+        ("maintenance_percent_of_price_per_year", "Maintenance (%)", 1.0, 0.0, 4.0, 0.1),
+        ("other_costs_monthly", "Other monthly costs ($)", 0.0, 0.0, None, 25.0),
+        ("years", "Simulation horizon (years)", 20, 1, 40, 1),
+        ("appreciation_percent_per_year", "Appreciation per year (%)", 3.0, 0.0, 10.0, 0.5),
+    ],
+}
+
+# Values saved for the fields of the rental type that is not selected
+INACTIVE_RENTAL_DEFAULTS = {
+    "long_term": {
+        "nightly_rate": 0.0,
+        "occupancy_percent": 65.0,
+        "cleaning_fee_per_stay": 100.0,
+        "avg_stay_length_nights": 3.0,
+        "platform_fee_percent": 15.0,
+    },
+    "short_term": {
+        "monthly_rent": 0.0,
+        "vacancy_percent": 0.0,
+    },
+}
+
+
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """Encode a frame as CSV with Arrow's writer; dates are written as YYYY-MM-DD."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if "date" in table.column_names:
+        table = table.set_column(table.column_names.index("date"), "date", table["date"].cast(pa.date32()))
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue()
+
+
+def _plot_run_series(df: pd.DataFrame) -> None:
+    """Monthly CF, cumulative CF and loan balance as stacked panels of one figure."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
+
+    ax1.plot(df["date"], df["monthly_cash_flow"])
+    ax1.axhline(0, linestyle="--")
+    ax1.set_title("Monthly cash flow")
+    ax1.set_ylabel("Monthly CF ($)")
+
+    ax2.plot(df["date"], df["cumulative_cash_flow"])
+    ax2.axhline(0, linestyle="--")
+    ax2.set_title("Cumulative cash flow")
+    ax2.set_ylabel("Cumulative CF ($)")
+
+    ax3.plot(df["date"], df["balance"])
+    ax3.set_title("Loan balance")
+    ax3.set_ylabel("Balance ($)")
+    ax3.set_xlabel("Date")
+
+    fig.tight_layout()
+    st.pyplot(fig)
+    plt.close(fig)
+
+
+def _plot_down_payment_results(
+    results_df: pd.DataFrame,
+    dp_percent: Optional[float],
+    dp_amount: Optional[float],
+    be_cash_flow: Optional[float],
+) -> None:
+    """Cash flow and mortgage vs down payment, with the break-even point marked."""
+    import matplotlib.pyplot as plt
+
+    fig_dp, ax_dp = plt.subplots(figsize=(12, 6))
+
+    # Plot cash flow and mortgage
+    ax_dp.plot(results_df['down_payment_percentage'], results_df['monthly_cash_flow'],
+              label='Monthly Cash Flow', marker='o', color='#1f77b4', markersize=8, linewidth=2)
+    ax_dp.plot(results_df['down_payment_percentage'], results_df['monthly_mortgage'],
+              label='Monthly Mortgage', marker='v', color='#8c564b', markersize=8, linewidth=2)
+
+    # Mark break-even point
+    if dp_amount is not None:
+        ax_dp.plot(dp_percent, be_cash_flow, 'ro', markersize=12, label='Break-Even', zorder=5)
+        ax_dp.annotate(
+            f'Break-Even\n{dp_percent:.2f}%\n${dp_amount:,.0f}',
+            xy=(dp_percent, be_cash_flow),
+            xytext=(10, 20),
+            textcoords='offset points',
+            fontsize=9,
+            bbox=dict(facecolor='white', edgecolor='green', boxstyle='round,pad=0.5'),
+            arrowprops=dict(arrowstyle='->', color='green', lw=2)
+        )
+
+    ax_dp.axhline(y=0, color='black', linestyle='--', linewidth=1, alpha=0.7)
+    ax_dp.set_xlabel('Down Payment (%)', fontsize=11)
+    ax_dp.set_ylabel('Monthly Amount ($)', fontsize=11)
+    ax_dp.set_title('Monthly Cash Flow vs Down Payment Percentage', fontsize=12, fontweight='bold')
+    ax_dp.legend(fontsize=10)
+    ax_dp.grid(True, alpha=0.3)
+
+    st.pyplot(fig_dp)
+    plt.close(fig_dp)
+
+
+def _sim_kwargs(p: dict) -> dict:
+    """PropertySim keyword arguments from saved scenario params, filling legacy defaults."""
+    return {
+        "purchase_price": p["purchase_price"],
+        "down_payment_percent": p["down_payment_percent"],
+        "annual_interest_percent": p["annual_interest_percent"],
+        "amort_years": p["amort_years"],
+        "rental_type": p.get("rental_type", "long_term"),
+        "monthly_rent": p.get("monthly_rent", 0.0),
+        "rent_growth_percent_per_year": p["rent_growth_percent_per_year"],
+        "vacancy_percent": p.get("vacancy_percent", 5.0),
+        "nightly_rate": p.get("nightly_rate", 0.0),
+        "occupancy_percent": p.get("occupancy_percent", 65.0),
+        "cleaning_fee_per_stay": p.get("cleaning_fee_per_stay", 100.0),
+        "avg_stay_length_nights": p.get("avg_stay_length_nights", 3.0),
+        "platform_fee_percent": p.get("platform_fee_percent", 15.0),
+        "tax_percent_of_price_per_year": p["tax_percent_of_price_per_year"],
+        "insurance_percent_of_price_per_year": p["insurance_percent_of_price_per_year"],
+        "maintenance_percent_of_price_per_year": p["maintenance_percent_of_price_per_year"],
+        "other_costs_monthly": p["other_costs_monthly"],
+        "years": p["years"],
+        "appreciation_percent_per_year": p["appreciation_percent_per_year"],
+        "closing_costs_percent_of_price": p["closing_costs_percent_of_price"],
+    }
+
+
+# Simulations are memoized on a frozen tuple of the PropertySim kwargs so an
+# unchanged scenario is not re-run.
+# Simulation caches are shared by all sessions: keep them bounded in size and age
+@st.cache_data(max_entries=32, ttl=3600)
+def run_sim(params_key: tuple):
+    sim = PropertySim(**dict(params_key))
+    df = sim.run()
+    return df, sim.kpis()
+
+
+@st.cache_data(max_entries=32, ttl=3600)
+def operating_series(operating_key: tuple) -> dict:
+    """Operating series keyed on the non-financing params, shared across down payments."""
+    sim = PropertySim(down_payment_percent=0.0, annual_interest_percent=0.0, amort_years=1, **dict(operating_key))
+    return sim.compute_operating_series()
+
+
 def render_simulator_page():
     # Session helpers
     if "selected_property_id" not in st.session_state:
@@ -81,7 +268,7 @@ def render_simulator_page():
 
     with c_left:
         st.subheader("Property")
-        props = sim_db.list_properties(DB_PATH)
+        props = _sidebar_state()["properties"]
         prop_options = ["New property"] + [f"{p['id']}: {p.get('address') or '(no address)'}" for p in props]
         prop_choice = st.selectbox("Select property", prop_options, index=0)
 
@@ -184,6 +371,7 @@ def render_simulator_page():
                     "map_image_path": map_path,
                 }
                 new_id = sim_db.upsert_property(up, DB_PATH)
+                _load_sidebar_state.clear()
                 st.success(f"Property saved (id {new_id}).")
                 st.session_state.selected_property_id = new_id
 
@@ -192,6 +380,7 @@ def render_simulator_page():
                 if st.button("Delete property"):
                     _remove_map_if_exists(prop_data.get("map_image_path"))
                     sim_db.delete_property(st.session_state.selected_property_id, DB_PATH)
+                    _load_sidebar_state.clear()
                     st.session_state.selected_property_id = None
                     st.session_state.selected_scenario_id = None
                     st.warning("Property deleted.")
@@ -201,7 +390,10 @@ def render_simulator_page():
         if st.session_state.selected_property_id is None:
             st.info("Save a property to create income scenarios.")
         else:
-            prop_record = sim_db.get_property(st.session_state.selected_property_id, DB_PATH)
+            state = _sidebar_state()
+            prop_record = next(
+                (prop for prop in state["properties"] if prop["id"] == st.session_state.selected_property_id), None
+            )
             required_purchase_fields = [
                 "purchase_price",
                 "down_payment_percent",
@@ -215,7 +407,7 @@ def render_simulator_page():
                 st.info("Add purchase details to the property before creating income scenarios.")
             else:
                 purchase_details = {k: prop_record.get(k) for k in required_purchase_fields}
-                scenarios = sim_db.list_scenarios(st.session_state.selected_property_id, DB_PATH)
+                scenarios = state["scenarios"]
                 scen_options = ["New scenario"] + [f"{s['id']}: {s['name']}" for s in scenarios]
 
                 # Find the index of the currently selected scenario
@@ -235,7 +427,7 @@ def render_simulator_page():
                 else:
                     scen_id = int(scen_choice.split(":")[0])
                     st.session_state.selected_scenario_id = scen_id
-                    rec = sim_db.get_scenario(scen_id, DB_PATH)
+                    rec = _sidebar_state()["current_scenario"]
                     scen_name = st.text_input("Scenario name", value=rec["name"])
                     params = rec.get("params") or {}
 
@@ -256,65 +448,32 @@ def render_simulator_page():
                 with st.form("scenario_form"):
                     st.caption("Define income and expense assumptions. These are saved to SQLite.")
 
-                    st.markdown("---")
-                    st.subheader("Revenue")
-
-                    # Conditional inputs based on rental type
-                    if rental_type == "long_term":
-                        monthly_rent = st.number_input("Monthly rent ($)", min_value=0.0, value=float(getp("monthly_rent", 2200.0)), step=50.0)
-                        rent_growth_pct = st.slider("Rent growth per year (%)", 0.0, 15.0, float(getp("rent_growth_percent_per_year", 2.0)), 0.5)
-                        vacancy_pct = st.slider("Vacancy (%)", 0.0, 30.0, float(getp("vacancy_percent", 5.0)), 0.5)
-
-                        # Set short-term values to 0
-                        nightly_rate = 0.0
-                        occupancy_pct = 65.0
-                        cleaning_fee = 100.0
-                        avg_stay = 3.0
-                        platform_fee = 15.0
-                    else:
-                        nightly_rate = st.number_input("Nightly rate ($)", min_value=0.0, value=float(getp("nightly_rate", 150.0)), step=10.0)
-                        occupancy_pct = st.slider("Occupancy rate (%)", 0.0, 100.0, float(getp("occupancy_percent", 65.0)), 1.0)
-                        cleaning_fee = st.number_input("Cleaning fee per stay ($)", min_value=0.0, value=float(getp("cleaning_fee_per_stay", 100.0)), step=10.0)
-                        avg_stay = st.number_input("Average stay length (nights)", min_value=1.0, value=float(getp("avg_stay_length_nights", 3.0)), step=0.5)
-                        platform_fee = st.slider("Platform fees (%)", 0.0, 30.0, float(getp("platform_fee_percent", 15.0)), 0.5)
-                        rent_growth_pct = st.slider("Rate growth per year (%)", 0.0, 15.0, float(getp("rent_growth_percent_per_year", 3.0)), 0.5)
-
-                        # Set long-term values to 0
-                        monthly_rent = 0.0
-                        vacancy_pct = 0.0
-
-                    st.markdown("---")
-                    st.subheader("Annual expense rates - % of price")
-                    tax_pct = st.slider("Property tax (%)", 0.0, 3.0, float(getp("tax_percent_of_price_per_year", 1.2)), 0.1)
-                    ins_pct = st.slider("Insurance (%)", 0.0, 3.0, float(getp("insurance_percent_of_price_per_year", 0.6)), 0.1)
-                    maint_pct = st.slider("Maintenance (%)", 0.0, 4.0, float(getp("maintenance_percent_of_price_per_year", 1.0)), 0.1)
-                    other_monthly = st.number_input("Other monthly costs ($)", min_value=0.0, value=float(getp("other_costs_monthly", 0.0)), step=25.0)
-
-                    st.markdown("---")
-                    st.subheader("Market assumptions")
-                    yrs = st.slider("Simulation horizon (years)", 1, 40, int(getp("years", 20)), 1)
-                    appr_pct = st.slider("Appreciation per year (%)", 0.0, 10.0, float(getp("appreciation_percent_per_year", 3.0)), 0.5)
+                    # All assumptions in one editable row: a single widget instead of one per field
+                    columns = SCENARIO_COLUMNS[rental_type] + SCENARIO_COLUMNS["common"]
+                    edited = st.data_editor(
+                        pd.DataFrame([{key: type(default)(getp(key, default)) for key, _, default, *_ in columns}]),
+                        column_config={
+                            key: st.column_config.NumberColumn(label, min_value=lo, max_value=hi, step=step, required=True)
+                            for key, label, _, lo, hi, step in columns
+                        },
+                        num_rows="fixed",
+                        hide_index=True,
+                        use_container_width=True,
+                    )
 
                     form_saved = st.form_submit_button("Save Income Scenario")
                     if form_saved:
-                        # Merge purchase details with scenario params
+                        row = edited.iloc[0]
+                        # Merge purchase details with scenario params; the other rental type's
+                        # fields keep their neutral values
                         param_dict = {
                             **purchase_details,
                             "rental_type": rental_type,
-                            "monthly_rent": monthly_rent,
-                            "rent_growth_percent_per_year": rent_growth_pct,
-                            "vacancy_percent": vacancy_pct,
-                            "nightly_rate": nightly_rate,
-                            "occupancy_percent": occupancy_pct,
-                            "cleaning_fee_per_stay": cleaning_fee,
-                            "avg_stay_length_nights": avg_stay,
-                            "platform_fee_percent": platform_fee,
-                            "tax_percent_of_price_per_year": tax_pct,
-                            "insurance_percent_of_price_per_year": ins_pct,
-                            "maintenance_percent_of_price_per_year": maint_pct,
-                            "other_costs_monthly": other_monthly,
-                            "years": yrs,
-                            "appreciation_percent_per_year": appr_pct,
+                            **INACTIVE_RENTAL_DEFAULTS[rental_type],
+                            **{
+                                key: default if pd.isna(row[key]) else type(default)(row[key])
+                                for key, _, default, *_ in columns
+                            },
                         }
                         if st.session_state.selected_scenario_id is None:
                             new_id = sim_db.create_scenario(
@@ -323,6 +482,7 @@ def render_simulator_page():
                                 params=param_dict,
                                 db_path=DB_PATH,
                             )
+                            _load_sidebar_state.clear()
                             st.session_state.selected_scenario_id = new_id
                             st.success(f"Income scenario created (id {new_id}).")
                         else:
@@ -332,21 +492,24 @@ def render_simulator_page():
                                 params=param_dict,
                                 db_path=DB_PATH,
                             )
+                            _load_sidebar_state.clear()
                             st.success("Income scenario updated.")
 
             if st.session_state.selected_scenario_id:
                 cc1, cc2, cc3 = st.columns(3)
                 if cc1.button("Duplicate income scenario"):
-                    rec = sim_db.get_scenario(st.session_state.selected_scenario_id, DB_PATH)
+                    rec = _sidebar_state()["current_scenario"]
                     new_id = sim_db.create_scenario(
                         property_id=rec["property_id"],
                         name=(rec["name"] + " copy")[:100],
                         params=rec["params"],
                         db_path=DB_PATH,
                     )
+                    _load_sidebar_state.clear()
                     st.success(f"Income scenario duplicated as id {new_id}.")
                 if cc2.button("Delete income scenario"):
                     sim_db.delete_scenario(st.session_state.selected_scenario_id, DB_PATH)
+                    _load_sidebar_state.clear()
                     st.session_state.selected_scenario_id = None
                     st.warning("Income scenario deleted.")
 
@@ -355,36 +518,16 @@ def render_simulator_page():
         if not st.session_state.selected_scenario_id:
             st.info("Select and save an income scenario to run the simulation.")
         else:
-            rec = sim_db.get_scenario(st.session_state.selected_scenario_id, DB_PATH)
+            rec = _sidebar_state()["current_scenario"]
             p = rec["params"]
 
             # Build the model from saved params
-            sim = PropertySim(
-                purchase_price=p["purchase_price"],
-                down_payment_percent=p["down_payment_percent"],
-                annual_interest_percent=p["annual_interest_percent"],
-                amort_years=p["amort_years"],
-                rental_type=p.get("rental_type", "long_term"),
-                monthly_rent=p.get("monthly_rent", 0.0),
-                rent_growth_percent_per_year=p["rent_growth_percent_per_year"],
-                vacancy_percent=p.get("vacancy_percent", 5.0),
-                nightly_rate=p.get("nightly_rate", 0.0),
-                occupancy_percent=p.get("occupancy_percent", 65.0),
-                cleaning_fee_per_stay=p.get("cleaning_fee_per_stay", 100.0),
-                avg_stay_length_nights=p.get("avg_stay_length_nights", 3.0),
-                platform_fee_percent=p.get("platform_fee_percent", 15.0),
-                tax_percent_of_price_per_year=p["tax_percent_of_price_per_year"],
-                insurance_percent_of_price_per_year=p["insurance_percent_of_price_per_year"],
-                maintenance_percent_of_price_per_year=p["maintenance_percent_of_price_per_year"],
-                other_costs_monthly=p["other_costs_monthly"],
-                years=p["years"],
-                appreciation_percent_per_year=p["appreciation_percent_per_year"],
-                closing_costs_percent_of_price=p["closing_costs_percent_of_price"],
-            )
+            sim_kwargs = _sim_kwargs(p)
+            params_key = tuple(sorted(sim_kwargs.items()))
+            sim = PropertySim(**sim_kwargs)
 
             if st.button("Run simulation"):
-                df = sim.run()
-                k = sim.kpis()
+                df, k = run_sim(params_key)
 
                 # KPIs
                 c1, c2, c3, c4 = st.columns(4)
@@ -399,53 +542,28 @@ def render_simulator_page():
                 c7.metric("Total invested", f"${k['total_invested_est']:,.0f}")
                 c8.metric("Total return", f"${k['total_return_est']:,.0f}")
 
-                # Plots
-                st.subheader("Monthly cash flow")
-                fig1, ax1 = plt.subplots(figsize=(10, 4))
-                ax1.plot(df["date"], df["monthly_cash_flow"])
-                ax1.axhline(0, linestyle="--")
-                ax1.set_ylabel("Monthly CF ($)")
-                ax1.set_xlabel("Date")
-                st.pyplot(fig1)
-
-                st.subheader("Cumulative cash flow")
-                fig2, ax2 = plt.subplots(figsize=(10, 4))
-                ax2.plot(df["date"], df["cumulative_cash_flow"])
-                ax2.axhline(0, linestyle="--")
-                ax2.set_ylabel("Cumulative CF ($)")
-                ax2.set_xlabel("Date")
-                st.pyplot(fig2)
-
-                st.subheader("Loan balance")
-                fig3, ax3 = plt.subplots(figsize=(10, 4))
-                ax3.plot(df["date"], df["balance"])
-                ax3.set_ylabel("Balance ($)")
-                ax3.set_xlabel("Date")
-                st.pyplot(fig3)
-
-                csv_bytes = df.to_csv(index=False).encode("utf-8")
+                _plot_run_series(df)
+
+                csv_bytes = _csv_bytes(df)
                 st.download_button("Download CSV", csv_bytes, file_name="simulation.csv", mime="text/csv")
 
-                # Save run to DB and also materialize a CSV per run
-                runs_dir = Path(__file__).resolve().parent / "runs"
-                runs_dir.mkdir(parents=True, exist_ok=True)
-            
-                run_id = sim_db.add_run(
-                    scenario_id=st.session_state.selected_scenario_id,
-                    kpis=k,
-                    csv_path=None,  # will set after we know id
-                    db_path=DB_PATH,
-                )
-                final_csv = runs_dir / f"run_{run_id}.csv"
+                # Materialize the CSV first so the run row is written once with its path
+                final_csv = RUNS_DIR / f"run_{uuid.uuid4().hex}.csv"
                 with open(final_csv, "wb") as f:
                     f.write(csv_bytes)
-                # update path in DB
-                # Quick update using sqlite3 directly
-                import sqlite3
-                conn = sqlite3.connect(DB_PATH)
-                conn.execute("UPDATE runs SET csv_path=? WHERE id=?", (str(final_csv), run_id))
-                conn.commit()
-                conn.close()
+
+                try:
+                    run_id = sim_db.add_run(
+                        scenario_id=st.session_state.selected_scenario_id,
+                        kpis=k,
+                        csv_path=str(final_csv),
+                        db_path=DB_PATH,
+                    )
+                except Exception:
+                    # No run row points at the file, so don't leave it behind in runs/
+                    final_csv.unlink(missing_ok=True)
+                    raise
+                _load_sidebar_state.clear()
 
                 st.success(f"Run saved (id {run_id}).")
 
@@ -460,7 +578,15 @@ def render_simulator_page():
                 with col2:
                     dp_upper = st.number_input("Max down payment (%)", min_value=0.0, max_value=100.0, value=50.0, step=1.0)
                 with col3:
-                    dp_num_sims = st.number_input("Number of simulations", min_value=5, max_value=100, value=25, step=5)
+                    dp_num_sims = st.number_input(
+                        "Number of simulations",
+                        min_value=5,
+                        max_value=100,
+                        value=25,
+                        step=5,
+                        help="Maximum number of bisection steps after a 5-point coarse sweep. The search stops sooner, "
+                             "usually after about 10 steps, once the break-even is pinned down to 0.01 percentage points.",
+                    )
             
                 run_dp_analysis = st.form_submit_button("Run Down Payment Analysis")
         
@@ -489,43 +615,23 @@ def render_simulator_page():
                         dp_pct = result['down_payment_percentage']
                         status_text.text(f"Testing {dp_pct:.1f}% down payment... Cash flow: ${cf:,.0f}/month")
                     
-                        # Update live chart
-                        if len(live_results) > 0:
-                            temp_df = pd.DataFrame(live_results)
-                        
-                            fig_live, ax_live = plt.subplots(figsize=(10, 5))
-                            ax_live.plot(temp_df['down_payment_percentage'], temp_df['monthly_cash_flow'], 
-                                        marker='o', color='#1f77b4', linewidth=2, markersize=8, label='Monthly Cash Flow')
-                            ax_live.plot(temp_df['down_payment_percentage'], temp_df['monthly_mortgage'], 
-                                        marker='v', color='#8c564b', linewidth=2, markersize=8, alpha=0.7, label='Monthly Mortgage')
-                            ax_live.axhline(y=0, color='red', linestyle='--', linewidth=2, alpha=0.5)
-                        
-                            # Highlight positive cash flow points
-                            positive = temp_df[temp_df['monthly_cash_flow'] > 0]
-                            if not positive.empty:
-                                ax_live.scatter(positive['down_payment_percentage'], positive['monthly_cash_flow'], 
-                                              color='green', s=200, zorder=5, marker='*', label='Positive CF')
-                        
-                            ax_live.set_xlabel('Down Payment (%)', fontsize=11, fontweight='bold')
-                            ax_live.set_ylabel('Monthly Amount ($)', fontsize=11, fontweight='bold')
-                            ax_live.set_title('🔴 LIVE: Cash Flow Analysis', fontsize=13, fontweight='bold')
-                            ax_live.legend(fontsize=9)
-                            ax_live.grid(True, alpha=0.3)
-                            plt.tight_layout()
-                        
-                            live_chart.pyplot(fig_live)
-                            plt.close(fig_live)
+                        # Update live chart; bisection points arrive out of order, so plot them sorted
+                        temp_df = pd.DataFrame(live_results).sort_values('down_payment_percentage')
+                        live_chart.line_chart(
+                            temp_df.set_index('down_payment_percentage')[['monthly_cash_flow', 'monthly_mortgage']]
+                        )
                         
-                            # Show live metrics
-                            with live_metrics.container():
-                                col1, col2, col3, col4 = st.columns(4)
-                                col1.metric("Current DP %", f"{dp_pct:.1f}%")
-                                col2.metric("Monthly CF", f"${cf:,.0f}", delta=f"${cf:,.0f}" if cf > 0 else None)
-                                col3.metric("Simulations", f"{current}/{total}")
-                                col4.metric("Status", "✅ Found!" if cf > 0 else "🔍 Searching...")
+                        # Show live metrics
+                        with live_metrics.container():
+                            col1, col2, col3, col4 = st.columns(4)
+                            col1.metric("Current DP %", f"{dp_pct:.1f}%")
+                            col2.metric("Monthly CF", f"${cf:,.0f}", delta=f"${cf:,.0f}" if cf > 0 else None)
+                            col3.metric("Simulations", f"{current}/{total}")
+                            col4.metric("Status", "✅ Found!" if cf > 0 else "🔍 Searching...")
                 
                     # Create AutoSim object
-                    auto_sim = AutoSim(sim)
+                    operating_key = tuple(item for item in params_key if item[0] not in FINANCING_FIELDS)
+                    auto_sim = AutoSim(sim, operating=operating_series(operating_key))
                 
                     # Run the analysis with live updates
                     results_df, dp_amount, dp_percent = auto_sim.down_payment_for_cashflow(
@@ -557,57 +663,31 @@ def render_simulator_page():
                 
                     # Show the plot
                     st.subheader("Cash Flow vs Down Payment")
-                    fig_dp, ax_dp = plt.subplots(figsize=(12, 6))
-                
-                    # Plot cash flow and mortgage
-                    ax_dp.plot(results_df['down_payment_percentage'], results_df['monthly_cash_flow'], 
-                              label='Monthly Cash Flow', marker='o', color='#1f77b4', markersize=8, linewidth=2)
-                    ax_dp.plot(results_df['down_payment_percentage'], results_df['monthly_mortgage'], 
-                              label='Monthly Mortgage', marker='v', color='#8c564b', markersize=8, linewidth=2)
-                
-                    # Mark break-even point
-                    if dp_amount is not None:
-                        ax_dp.plot(dp_percent, be_row['monthly_cash_flow'], 'ro', markersize=12, label='Break-Even', zorder=5)
-                        ax_dp.annotate(
-                            f'Break-Even\n{dp_percent:.2f}%\n${dp_amount:,.0f}',
-                            xy=(dp_percent, be_row['monthly_cash_flow']),
-                            xytext=(10, 20),
-                            textcoords='offset points',
-                            fontsize=9,
-                            bbox=dict(facecolor='white', edgecolor='green', boxstyle='round,pad=0.5'),
-                            arrowprops=dict(arrowstyle='->', color='green', lw=2)
-                        )
-                
-                    ax_dp.axhline(y=0, color='black', linestyle='--', linewidth=1, alpha=0.7)
-                    ax_dp.set_xlabel('Down Payment (%)', fontsize=11)
-                    ax_dp.set_ylabel('Monthly Amount ($)', fontsize=11)
-                    ax_dp.set_title('Monthly Cash Flow vs Down Payment Percentage', fontsize=12, fontweight='bold')
-                    ax_dp.legend(fontsize=10)
-                    ax_dp.grid(True, alpha=0.3)
-                
-                    st.pyplot(fig_dp)
+                    _plot_down_payment_results(
+                        results_df, dp_percent, dp_amount,
+                        be_row['monthly_cash_flow'] if dp_amount is not None else None,
+                    )
                 
                     # Show detailed results table
                     with st.expander("View detailed results"):
                         st.dataframe(results_df, use_container_width=True)
                     
                         # Download button for results
-                        csv_dp = results_df.to_csv(index=False).encode('utf-8')
                         st.download_button(
                             "Download Down Payment Analysis CSV",
-                            csv_dp,
+                            _csv_bytes(results_df),
                             file_name="down_payment_analysis.csv",
                             mime="text/csv"
                         )
 
             st.markdown("---")
             st.subheader("Run history")
-            hist = sim_db.list_runs(st.session_state.selected_scenario_id, DB_PATH)
+            hist = _sidebar_state()["runs"]
             if not hist:
                 st.info("No runs saved yet.")
             else:
-                dfh = pd.DataFrame(hist)
-                st.dataframe(dfh[["id", "run_at", "monthly_mortgage", "initial_coc", "ending_monthly_cf", "cumulative_cf", "terminal_equity", "total_invested_est", "total_return_est", "payback_month", "csv_path"]], use_container_width=True)
+                dfh = pd.DataFrame.from_records(hist, columns=sim_db.RUN_SUMMARY_COLUMNS)
+                st.dataframe(dfh, hide_index=True, use_container_width=True)
 
 
 def render_dashboard_page():
@@ -5,10 +5,84 @@ This module provides tools to run multiple simulations with varying parameters
 to find optimal values, such as the minimum down payment for positive cash flow.
 """
 
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from dataclasses import replace
-from property_sim_refactor import PropertySim
+from property_sim_refactor import PropertySim, level_payment, remaining_balance
+
+
+def simulate_down_payment(
+    base_sim: PropertySim,
+    down_payment_percent: float,
+    operating: dict | None = None,
+) -> dict:
+    """
+    Simulate base_sim at the given down payment percentage.
+    
+    Only the financing depends on the down payment, so when the operating series of
+    base_sim is passed in, just the amortization schedule is recomputed.
+    
+    Args:
+        base_sim: The PropertySim to vary
+        down_payment_percent: Down payment percentage to simulate
+        operating: Optional base_sim.compute_operating_series() result to reuse
+    
+    Returns:
+        dict with the first-month figures and headline KPIs used by the sweep
+    """
+    # Create a new sim with this down payment percentage
+    sim = replace(base_sim, down_payment_percent=down_payment_percent)
+    if operating is None:
+        operating = sim.compute_operating_series()
+    # Financed through base_sim so its cached payment factor is reused across calls
+    finance = base_sim.finance_series(down_payment_percent=down_payment_percent)
+    
+    monthly_cf = operating['effective_rent'] - operating['expenses'] - finance['mortgage_payment']
+    
+    return {
+        'down_payment_percentage': down_payment_percent,
+        'down_payment': sim.down_payment,
+        # First month's figures (initial monthly cash flow)
+        'monthly_cash_flow': float(monthly_cf[0]),
+        'effective_rent': float(operating['effective_rent'][0]),
+        'monthly_expenses': float(operating['expenses'][0]),
+        'monthly_mortgage': float(finance['mortgage_payment'][0]),
+        'initial_coc_percent': sim.initial_cash_on_cash_percent(),
+        'cumulative_cf': float(np.cumsum(monthly_cf)[-1]),
+        'terminal_equity': float(operating['property_value'][-1] - finance['balance'][-1]),
+    }
+
+
+def _run_one(base_sim: PropertySim, down_payment_percent: float) -> dict:
+    """
+    Run the full simulation of base_sim at one down payment percentage.
+    
+    Module level so that ProcessPoolExecutor workers can unpickle it.
+    
+    Returns:
+        dict with the columns of simulate_down_payment(), followed by the KPIs that only a
+        full run provides
+    """
+    sim = replace(base_sim, down_payment_percent=down_payment_percent)
+    out = sim.run_kpis_only()
+    return {
+        'down_payment_percentage': down_payment_percent,
+        'down_payment': sim.down_payment,
+        'monthly_cash_flow': out['monthly_cash_flow'],
+        'effective_rent': out['effective_rent'],
+        'monthly_expenses': out['expenses'],
+        'monthly_mortgage': out['monthly_mortgage'],
+        'initial_coc_percent': out['initial_cash_on_cash_percent'],
+        'cumulative_cf': out['cumulative_cash_flow'],
+        'terminal_equity': out['terminal_equity'],
+        'ending_monthly_cash_flow': out['ending_monthly_cash_flow'],
+        'total_invested_est': out['total_invested_est'],
+        'total_return_est': out['total_return_est'],
+        'payback_month_on_upfront': out['payback_month_on_upfront'],
+    }
 
 
 class AutoSim:
@@ -16,103 +90,197 @@ class AutoSim:
     Wrapper around PropertySim to run multiple simulations with varying parameters.
     """
 
-    def __init__(self, base_sim: PropertySim):
+    def __init__(self, base_sim: PropertySim, operating: dict | None = None):
         """
         Initialize with a base PropertySim configuration.
         
         Args:
             base_sim: The base PropertySim object to use as a template
+            operating: Optional precomputed base_sim.compute_operating_series(); computed
+                on first use otherwise
         """
         self.base_sim = base_sim
+        self._operating = operating
+
+    @property
+    def operating(self) -> dict:
+        """Operating series of base_sim, shared by every down payment evaluated."""
+        if self._operating is None:
+            self._operating = self.base_sim.compute_operating_series()
+        return self._operating
+
+    def down_payment_for_cashflow_vec(self, dp_array) -> pd.DataFrame:
+        """
+        Evaluate many down payment percentages in one vectorized pass.
+
+        Only the financing depends on the down payment, so rent, expenses and property
+        value come from the shared operating series, and the mortgage terms are broadcast
+        over dp_array with the closed-form amortization formulas.
+
+        Args:
+            dp_array: Down payment percentages to evaluate
+
+        Returns:
+            DataFrame with one row per percentage and the same columns as
+            simulate_down_payment()
+        """
+        dp = np.asarray(dp_array, dtype=float)
+        ref = self.base_sim
+        operating = self.operating
+
+        price = float(ref.purchase_price)
+        r = ref.monthly_rate
+        n = ref.amort_years * 12
+        paid_months = min(ref.total_months, n)
+
+        down_payment = price * dp / 100.0
+        loan = np.maximum(price - down_payment, 0.0)
+        payment = level_payment(loan, r, n)
+
+        # Balance left at the end of the horizon (zero once the loan is paid off)
+        if paid_months >= n:
+            end_balance = np.zeros_like(loan)
+        else:
+            end_balance = np.maximum(remaining_balance(loan, r, payment, paid_months), 0.0)
+
+        effective_rent = float(operating['effective_rent'][0])
+        monthly_expenses = float(operating['expenses'][0])
+        operating_total = float((operating['effective_rent'] - operating['expenses']).sum())
+        noi_year1 = (effective_rent - monthly_expenses) * 12
+
+        return pd.DataFrame({
+            'down_payment_percentage': dp,
+            'down_payment': down_payment,
+            'monthly_cash_flow': effective_rent - monthly_expenses - payment,
+            'effective_rent': np.full_like(dp, effective_rent),
+            'monthly_expenses': np.full_like(dp, monthly_expenses),
+            'monthly_mortgage': payment,
+            'initial_coc_percent': noi_year1 / (down_payment + ref.closing_costs) * 100.0,
+            'cumulative_cf': operating_total - payment * paid_months,
+            'terminal_equity': float(operating['property_value'][-1]) - end_balance,
+        })
+
+    def down_payment_sweep(self, dp_array, parallel: bool = False, max_workers: int | None = None) -> pd.DataFrame:
+        """
+        Run the full simulation at each down payment percentage and collect the KPIs.
+        
+        Unlike down_payment_for_cashflow_vec(), every point is a complete PropertySim.run(),
+        so all KPIs (payback month, total return, ...) are available. The runs are
+        independent, so with parallel=True they are spread over worker processes.
+        
+        Args:
+            dp_array: Down payment percentages to simulate
+            parallel: Run the simulations in a ProcessPoolExecutor
+            max_workers: Worker processes when parallel (default: os.cpu_count())
+        
+        Returns:
+            DataFrame with one row per percentage, in the order given: the columns of
+            down_payment_for_cashflow() plus ending_monthly_cash_flow, total_invested_est,
+            total_return_est and payback_month_on_upfront
+        """
+        dp_values = [float(dp) for dp in dp_array]
+        if parallel and len(dp_values) > 1:
+            # A fresh copy carries only the parameters, not cached values or arrays of earlier
+            # runs; chunking pickles it once per batch of points rather than once per point
+            template = replace(self.base_sim)
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(dp_values) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rows = list(executor.map(
+                    _run_one, [template] * len(dp_values), dp_values, chunksize=chunksize
+                ))
+        else:
+            rows = [_run_one(self.base_sim, dp) for dp in dp_values]
+        return pd.DataFrame(rows)
 
     def down_payment_for_cashflow(
         self, 
         upper_limit: float = 50.0, 
         lower_limit: float = 5.0, 
         num_simulations: int = 25,
-        progress_callback=None
+        progress_callback=None,
+        tolerance: float = 0.01,
     ) -> tuple[pd.DataFrame, float | None, float | None]:
         """
         Find the minimum down payment percentage that results in positive monthly cash flow.
         
-        This method runs multiple simulations with different down payment percentages
-        to find the break-even point where monthly cash flow becomes positive.
+        Monthly cash flow rises monotonically with the down payment, so the break-even
+        point is located by bisection, recomputing only the financing at each step. A coarse
+        5-point sweep (vectorized) brackets the crossing and provides the plot outline.
         
         Args:
             upper_limit: Maximum down payment percentage to test (default 50%)
             lower_limit: Minimum down payment percentage to test (default 5%)
-            num_simulations: Number of simulations to run (default 25)
-            progress_callback: Optional callback function(current_index, total, current_result_dict)
+            num_simulations: Cap on the number of bisection steps after the coarse sweep
+            progress_callback: Optional callback function(current_step, total_steps, current_result_dict),
+                called for each coarse sweep point and then after each bisection step
+            tolerance: Bracket width in percentage points at which the search stops (default
+                0.01, about 10 steps); the returned percentage is at most this far above the
+                exact break-even
             
         Returns:
             tuple containing:
-                - DataFrame with all simulation results
+                - DataFrame with the coarse sweep and bisection results, sorted by percentage
                 - Dollar amount of down payment that achieves positive cash flow (or None)
                 - Percentage that achieves positive cash flow (or None)
         """
-        # Create a range of down payment percentages to test
-        down_payment_range = np.linspace(lower_limit, upper_limit, num_simulations)
+        if not tolerance > 0:
+            raise ValueError(f"tolerance must be a positive number of percentage points, got {tolerance!r}")
         
-        # Store results
-        results = []
+        def cash_flow_at(down_payment_percent: float) -> dict:
+            return simulate_down_payment(self.base_sim, down_payment_percent, operating=self.operating)
         
-        # Run simulations for each down payment percentage
-        for idx, down_payment_percent in enumerate(down_payment_range):
-            # Create a new sim with this down payment percentage
-            sim = replace(self.base_sim, down_payment_percent=down_payment_percent)
-            
-            # Run the simulation
-            df = sim.run()
-            kpis = sim.kpis()
-            
-            # Get the first month's cash flow (initial monthly cash flow)
-            monthly_cashflow = df['monthly_cash_flow'].iloc[0]
-            
-            # Get the down payment dollar amount
-            down_payment = sim.down_payment
+        # Coarse sweep, used for the plot and to bracket the break-even point
+        coarse_df = self.down_payment_for_cashflow_vec(np.linspace(lower_limit, upper_limit, 5))
+        coarse_cf = coarse_df['monthly_cash_flow'].to_numpy()
+        first_positive = int(np.searchsorted(coarse_cf > 0, True))
+        
+        # Bisection is only needed when the crossing lies strictly inside the range
+        num_steps = 0
+        if 0 < first_positive < len(coarse_df):
+            lo = float(coarse_df['down_payment_percentage'].iloc[first_positive - 1])
+            hi = float(coarse_df['down_payment_percentage'].iloc[first_positive])
+            hi_row = coarse_df.iloc[first_positive].to_dict()
             
-            # Get other key metrics from the first month
-            effective_rent = df['effective_rent'].iloc[0]
-            monthly_expenses = df['expenses'].iloc[0]
-            monthly_mortgage = df['mortgage_payment'].iloc[0]
+            # Bisect until the bracket is narrower than the tolerance, or the step cap is hit
+            num_steps = min(num_simulations, max(0, math.ceil(math.log2((hi - lo) / tolerance))))
+        
+        # Progress covers the coarse points too, so callers see every evaluated point
+        total_steps = len(coarse_df) + num_steps
+        if progress_callback:
+            for i, row in enumerate(coarse_df.to_dict('records')):
+                progress_callback(i + 1, total_steps, row)
+        
+        if first_positive == len(coarse_df):
+            # Never positive within the range
+            return coarse_df, None, None
+        if first_positive == 0:
+            # Already positive at the lower limit
+            row = coarse_df.iloc[0]
+            return coarse_df, float(row['down_payment']), float(row['down_payment_percentage'])
+        
+        # Bisection rows go straight into preallocated columns
+        steps = {col: np.empty(num_steps) for col in coarse_df.columns}
+        for step in range(num_steps):
+            mid = (lo + hi) / 2.0
+            result_dict = cash_flow_at(mid)
+            for col, values in steps.items():
+                values[step] = result_dict[col]
             
-            # Store the results
-            result_dict = {
-                'down_payment_percentage': down_payment_percent,
-                'down_payment': down_payment,
-                'monthly_cash_flow': monthly_cashflow,
-                'effective_rent': effective_rent,
-                'monthly_expenses': monthly_expenses,
-                'monthly_mortgage': monthly_mortgage,
-                'initial_coc_percent': kpis['initial_cash_on_cash_percent'],
-                'cumulative_cf': kpis['cumulative_cash_flow'],
-                'terminal_equity': kpis['terminal_equity'],
-            }
-            results.append(result_dict)
+            if result_dict['monthly_cash_flow'] > 0:
+                hi, hi_row = mid, result_dict
+            else:
+                lo = mid
             
             # Call progress callback if provided
             if progress_callback:
-                progress_callback(idx + 1, num_simulations, result_dict)
-            
-            # Early exit: stop if we found positive cash flow
-            if monthly_cashflow > 0:
-                break
-        
-        # Convert to DataFrame
-        results_df = pd.DataFrame(results)
-        
-        # Find the first down payment that results in positive monthly cash flow
-        positive_cf = results_df[results_df['monthly_cash_flow'] > 0]
-        
-        if not positive_cf.empty:
-            down_payment_cashflow = float(positive_cf['down_payment'].iloc[0])
-            down_payment_percent_cashflow = float(positive_cf['down_payment_percentage'].iloc[0])
-        else:
-            down_payment_cashflow = None
-            down_payment_percent_cashflow = None
+                progress_callback(len(coarse_df) + step + 1, total_steps, result_dict)
         
-        return results_df, down_payment_cashflow, down_payment_percent_cashflow
-
+        results_df = (
+            pd.concat([coarse_df, pd.DataFrame(steps)], ignore_index=True)
+            .sort_values('down_payment_percentage', ignore_index=True)
+        )
+        return results_df, float(hi_row['down_payment']), float(hi_row['down_payment_percentage'])
 
 def create_down_payment_plot(df: pd.DataFrame, save_path: str | None = None) -> None:
     """
@@ -145,37 +313,44 @@ def create_down_payment_plot(df: pd.DataFrame, save_path: str | None = None) ->
         linewidth=2
     )
     
-    # Find and mark the break-even point (where cash flow crosses zero)
-    zero_crossings = df[df['monthly_cash_flow'] * df['monthly_cash_flow'].shift(1) <= 0]
-    
-    if not zero_crossings.empty:
-        for _, row in zero_crossings.iterrows():
-            break_even_text = (
-                f'Break-Even Cash Flow\n'
-                f'{row["down_payment_percentage"]:.2f}%\n'
-                f'${row["down_payment"]:,.0f}'
-            )
-            break_even_coords = (row['down_payment_percentage'], row['monthly_cash_flow'])
-            
-            # Mark the break-even point
-            plt.plot(
-                row['down_payment_percentage'], 
-                row['monthly_cash_flow'], 
-                'ro', 
-                markersize=12,
-                label='Break-Even'
-            )
-            
-            # Add annotation
-            plt.annotate(
-                break_even_text,
-                xy=break_even_coords,
-                xytext=(10, 20),
-                textcoords='offset points',
-                fontsize=10,
-                bbox=dict(facecolor='white', edgecolor='green', boxstyle='round,pad=0.5'),
-                arrowprops=dict(arrowstyle='->', color='green', lw=2)
-            )
+    # Find and mark the break-even points: where cash flow turns positive (or back),
+    # interpolated linearly between the neighbouring samples
+    x = df['down_payment_percentage'].to_numpy()
+    amount = df['down_payment'].to_numpy()
+    cf = df['monthly_cash_flow'].to_numpy()
+    positive = cf > 0
+    crossings = np.flatnonzero(positive[1:] != positive[:-1]) + 1
+    
+    for i in crossings:
+        t = (0.0 - cf[i - 1]) / (cf[i] - cf[i - 1])
+        be_pct = x[i - 1] + t * (x[i] - x[i - 1])
+        be_amount = amount[i - 1] + t * (amount[i] - amount[i - 1])
+        break_even_text = (
+            f'Break-Even Cash Flow\n'
+            f'{be_pct:.2f}%\n'
+            f'${be_amount:,.0f}'
+        )
+        break_even_coords = (be_pct, 0.0)
+        
+        # Mark the break-even point
+        plt.plot(
+            be_pct, 
+            0.0, 
+            'ro', 
+            markersize=12,
+            label='Break-Even'
+        )
+        
+        # Add annotation
+        plt.annotate(
+            break_even_text,
+            xy=break_even_coords,
+            xytext=(10, 20),
+            textcoords='offset points',
+            fontsize=10,
+            bbox=dict(facecolor='white', edgecolor='green', boxstyle='round,pad=0.5'),
+            arrowprops=dict(arrowstyle='->', color='green', lw=2)
+        )
     
     # Add horizontal line at y=0
     plt.axhline(y=0, color='black', linestyle='--', linewidth=1, alpha=0.7)
@@ -1,6 +1,7 @@
 
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from functools import cached_property
+from typing import Optional, Dict, Any, Tuple
 import math
 import pandas as pd
 import numpy as np
@@ -15,9 +16,29 @@ def pct_to_dec(p: float) -> float:
 def clamp_nonnegative(x: float) -> float:
     return max(0.0, float(x))
 
+def level_payment(loan, monthly_rate: float, n: int):
+    """Fixed-rate fully amortizing payment over n months; loan may be an array."""
+    if monthly_rate == 0:
+        return loan / n
+    growth = (1 + monthly_rate) ** n
+    return loan * (monthly_rate * growth) / (growth - 1)
+
+def remaining_balance(loan, monthly_rate: float, payment, k):
+    """
+    Closed-form balance after k level payments (loan, payment and k broadcast as arrays).
+    Not clipped: past the final payment the result turns negative.
+    """
+    if monthly_rate == 0:
+        return loan - payment * k
+    growth = (1 + monthly_rate) ** k
+    return loan * growth - payment * (growth - 1) / monthly_rate
+
 # ------------------------------
 # Property Simulation
 # ------------------------------
+# Fields that only affect financing; the operating series does not depend on them
+FINANCING_FIELDS = ("down_payment_percent", "annual_interest_percent", "amort_years")
+
 @dataclass
 class PropertySim:
     # Required
@@ -58,69 +79,74 @@ class PropertySim:
     start_date: str = "2025-01-01"
 
     # Internal fields (auto-populated)
-    df: Optional[pd.DataFrame] = field(default=None, init=False)
     results: Dict[str, Any] = field(default_factory=dict, init=False)
+    _series: Optional[Dict[str, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    _df: Optional[pd.DataFrame] = field(default=None, init=False, repr=False, compare=False)
 
     # ------------------------------
     # Derived values
+    # Cached on first access: a sim is not mutated after construction
+    # (AutoSim varies parameters through dataclasses.replace)
     # ------------------------------
-    @property
+    @cached_property
     def closing_costs(self) -> float:
         return self.purchase_price * pct_to_dec(self.closing_costs_percent_of_price)
 
-    @property
+    @cached_property
     def down_payment(self) -> float:
         return self.purchase_price * pct_to_dec(self.down_payment_percent)
 
-    @property
+    @cached_property
     def loan_amount(self) -> float:
         return clamp_nonnegative(self.purchase_price - self.down_payment)
 
-    @property
+    @cached_property
     def total_upfront(self) -> float:
         return self.down_payment + self.closing_costs
 
-    @property
+    @cached_property
     def tax_yearly(self) -> float:
         return self.purchase_price * pct_to_dec(self.tax_percent_of_price_per_year)
 
-    @property
+    @cached_property
     def insurance_yearly(self) -> float:
         return self.purchase_price * pct_to_dec(self.insurance_percent_of_price_per_year)
 
-    @property
+    @cached_property
     def maintenance_yearly(self) -> float:
         return self.purchase_price * pct_to_dec(self.maintenance_percent_of_price_per_year)
 
-    @property
+    @cached_property
     def monthly_rate(self) -> float:
         return pct_to_dec(self.annual_interest_percent) / 12.0
 
-    @property
+    @cached_property
     def total_months(self) -> int:
         return int(self.years * 12)
 
+    @cached_property
+    def _payment_factor(self) -> float:
+        # Payment per dollar borrowed; (1 + r) ** n and the r == 0 branch are evaluated once per sim
+        return level_payment(1.0, self.monthly_rate, self.amort_years * 12)
+
+    @cached_property
+    def _default_mortgage_payment(self) -> float:
+        return self.mortgage_payment_monthly(balance=self.loan_amount)
+
     def mortgage_payment_monthly(self, balance: Optional[float]=None) -> float:
         """Fixed-rate fully amortizing monthly payment (PMT)."""
-        L = self.loan_amount if balance is None else balance
-        r = self.monthly_rate
-        n = self.amort_years * 12
-        if r == 0:
-            return L / n
-        return L * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
+        if balance is None:
+            return self._default_mortgage_payment
+        return balance * self._payment_factor
 
     # ------------------------------
     # Revenue calculation
     # ------------------------------
-    def calculate_monthly_revenue(self, base_rate: float) -> float:
+    @cached_property
+    def _revenue_coeffs(self) -> Tuple[float, float]:
         """
-        Calculate effective monthly revenue based on rental type.
-        
-        Args:
-            base_rate: For long-term this is monthly_rent, for short-term this is nightly_rate
-        
-        Returns:
-            Effective monthly revenue after vacancy/occupancy and fees
+        Effective monthly revenue as a linear function of the base rate: (a, b) with
+        revenue = a * base_rate + b. The rental-type branch is taken once here.
         """
         if self.rental_type == "short_term":
             # Short-term rental calculation
@@ -128,15 +154,26 @@ class PropertySim:
             occupied_days = days_per_month * pct_to_dec(self.occupancy_percent)
             num_stays = occupied_days / self.avg_stay_length_nights
             
-            # Gross revenue = (nightly rate * occupied nights) + (cleaning fees * number of stays)
-            gross_monthly = (base_rate * occupied_days) + (self.cleaning_fee_per_stay * num_stays)
-            
-            # Net after platform fees
-            net_monthly = gross_monthly * (1 - pct_to_dec(self.platform_fee_percent))
-            return net_monthly
+            # Gross revenue = (nightly rate * occupied nights) + (cleaning fees * number of stays),
+            # net after platform fees
+            net_share = 1 - pct_to_dec(self.platform_fee_percent)
+            return occupied_days * net_share, self.cleaning_fee_per_stay * num_stays * net_share
         else:
             # Long-term rental calculation
-            return base_rate * (1 - pct_to_dec(self.vacancy_percent))
+            return 1 - pct_to_dec(self.vacancy_percent), 0.0
+
+    def calculate_monthly_revenue(self, base_rate: float) -> float:
+        """
+        Calculate effective monthly revenue based on rental type.
+        
+        Args:
+            base_rate: For long-term this is monthly_rent, for short-term this is nightly_rate
+        
+        Returns:
+            Effective monthly revenue after vacancy/occupancy and fees
+        """
+        a, b = self._revenue_coeffs
+        return a * base_rate + b
 
     # ------------------------------
     # Cash-on-cash
@@ -156,80 +193,81 @@ class PropertySim:
     # ------------------------------
     # Simulation
     # ------------------------------
-    def run(self) -> pd.DataFrame:
-        months = self.total_months
-        current_price = float(self.purchase_price)
-        balance = float(self.loan_amount)
-        mmtg = self.mortgage_payment_monthly(balance=None)
-
-        ts = []
-        date = pd.Timestamp(self.start_date)
-
-        monthly_tax = self.tax_yearly / 12.0
-        monthly_ins = self.insurance_yearly / 12.0
-        monthly_maint = self.maintenance_yearly / 12.0
-
+    def compute_operating_series(self) -> Dict[str, np.ndarray]:
+        """
+        Monthly effective rent, expenses and property value.
+        These do not depend on the financing (see FINANCING_FIELDS).
+        """
         # Initialize base rate based on rental type
         if self.rental_type == "short_term":
             base_rate = float(self.nightly_rate)
         else:
             base_rate = float(self.monthly_rent)
-        
-        rent_growth = pct_to_dec(self.rent_growth_percent_per_year)
-        appr = pct_to_dec(self.appreciation_percent_per_year)
-
-        cumulative_cf = 0.0
-        cumulative_principal = 0.0
-
-        for m in range(months):
-            # Annual bumps at the start of each new year after month 0
-            if m > 0 and m % 12 == 0:
-                base_rate *= (1 + rent_growth)
-                current_price *= (1 + appr)
-                monthly_tax = (current_price * pct_to_dec(self.tax_percent_of_price_per_year)) / 12.0
-                monthly_ins = (current_price * pct_to_dec(self.insurance_percent_of_price_per_year)) / 12.0
-                monthly_maint = (current_price * pct_to_dec(self.maintenance_percent_of_price_per_year)) / 12.0
-
-            # Income - calculate based on rental type
-            eff_rent = self.calculate_monthly_revenue(base_rate)
-
-            # Mortgage split
-            interest = balance * self.monthly_rate
-            principal = min(mmtg - interest, balance)  # avoid negative balance
-            principal = clamp_nonnegative(principal)
-            balance = clamp_nonnegative(balance - principal)
-
-            # Expenses
-            expenses = monthly_tax + monthly_ins + monthly_maint + self.other_costs_monthly
-
-            # Cash flow after debt service
-            monthly_cf = eff_rent - expenses - mmtg
-            cumulative_cf += monthly_cf
-            cumulative_principal += principal
-
-            ts.append({
-                "date": date,
-                "month_index": m,
-                "effective_rent": eff_rent,
-                "expenses": expenses,
-                "mortgage_payment": mmtg,
-                "interest": interest,
-                "principal": principal,
-                "balance": balance,
-                "monthly_cash_flow": monthly_cf,
-                "cumulative_cash_flow": cumulative_cf,
-                "property_value": current_price,
-            })
-
-            date = date + pd.DateOffset(months=1)
-
-            if balance <= 0.0:
-                # After payoff: mortgage payment becomes 0, cash flow jumps
-                # We still continue the sim horizon to show post-payoff CF
-                mmtg = 0.0
-
-        df = pd.DataFrame(ts)
-        self.df = df
+
+        rev_scale, rev_fixed = self._revenue_coeffs
+
+        # Rent and price step up at the start of each new year after month 0
+        year = np.arange(self.total_months) // 12
+        value = float(self.purchase_price) * (1 + pct_to_dec(self.appreciation_percent_per_year)) ** year
+        base_rates = base_rate * (1 + pct_to_dec(self.rent_growth_percent_per_year)) ** year
+
+        eff_rent = rev_scale * base_rates + rev_fixed
+        # Tax, insurance and maintenance folded into one monthly rate on the price: one array multiply
+        monthly_expense_rate = (
+            self.tax_percent_of_price_per_year
+            + self.insurance_percent_of_price_per_year
+            + self.maintenance_percent_of_price_per_year
+        ) / 1200.0
+        expenses = value * monthly_expense_rate + float(self.other_costs_monthly)
+        return {"effective_rent": eff_rent, "expenses": expenses, "property_value": value}
+
+    def finance_series(
+        self, down_payment_percent: Optional[float] = None, pmt: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Monthly mortgage payment, interest, principal and balance.
+
+        Args:
+            down_payment_percent: Down payment to finance with (defaults to this sim's)
+            pmt: Monthly payment for that loan, if the caller already has it
+        """
+        if down_payment_percent is None:
+            loan = self.loan_amount
+        else:
+            loan = clamp_nonnegative(self.purchase_price - self.purchase_price * pct_to_dec(down_payment_percent))
+        loan = float(loan)
+        r = self.monthly_rate
+        n = self.amort_years * 12
+        if pmt is None:
+            pmt = self.mortgage_payment_monthly(balance=loan)
+
+        # Closed-form balance after k payments; payments stop once the loan is paid off
+        k = np.minimum(np.arange(1, self.total_months + 1), n)
+        balance = remaining_balance(loan, r, pmt, k)
+        balance = np.where(k >= n, 0.0, np.maximum(balance, 0.0))
+
+        prev_balance = np.concatenate(([loan], balance[:-1]))
+        interest = prev_balance * r
+        principal = prev_balance - balance
+        payment = np.where(prev_balance > 0.0, pmt, 0.0)
+        return {"mortgage_payment": payment, "interest": interest, "principal": principal, "balance": balance}
+
+    def _simulate(self) -> Dict[str, np.ndarray]:
+        """
+        Compute every monthly series as arrays and fill self.results with the KPIs.
+        Shared by run() and run_kpis_only(); no DataFrame is built here.
+        """
+        pmt = self.mortgage_payment_monthly()
+        operating = self.compute_operating_series()
+        finance = self.finance_series(pmt=pmt)
+
+        # Cash flow after debt service
+        monthly_cf = operating["effective_rent"] - operating["expenses"] - finance["mortgage_payment"]
+        cumulative = np.cumsum(monthly_cf)
+
+        current_price = float(operating["property_value"][-1])
+        balance = float(finance["balance"][-1])
+        cumulative_cf = float(cumulative[-1])
 
         # Basic summary metrics
         upfront = self.total_upfront
@@ -245,27 +283,86 @@ class PropertySim:
         # Break-even: when cumulative CF crosses zero vs upfront is a common view.
         # We track when cumulative CF equals upfront (payback)
         payback_month = None
-        if df["cumulative_cash_flow"].iloc[0] >= 0:
+        if cumulative[0] >= 0:
             # If immediately positive, payback month is 0
             payback_month = 0
         else:
             # Find first index where cumulative CF >= upfront *or* crosses 0, pick the upfront payback
             # Here we choose payback on upfront: cumulative_CF >= total_upfront
-            crossed = np.where(df["cumulative_cash_flow"].values >= upfront)[0]
+            crossed = np.where(cumulative >= upfront)[0]
             payback_month = int(crossed[0]) if len(crossed) > 0 else None
 
         self.results = {
-            "monthly_mortgage": self.mortgage_payment_monthly(),
+            "monthly_mortgage": pmt,
             "initial_cash_on_cash_percent": self.initial_cash_on_cash_percent(),
-            "ending_monthly_cash_flow": float(df["monthly_cash_flow"].iloc[-1]),
+            "ending_monthly_cash_flow": float(monthly_cf[-1]),
             "cumulative_cash_flow": float(cumulative_cf),
             "terminal_equity": float(terminal_equity),
             "total_invested_est": float(total_invested),
             "total_return_est": float(total_return),
             "payback_month_on_upfront": payback_month,
         }
+        self._series = {
+            **operating,
+            **finance,
+            "monthly_cash_flow": monthly_cf,
+            "cumulative_cash_flow": cumulative,
+        }
+        self._df = None
+        return self._series
+
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """Monthly results of the last simulation, built from its arrays on first access (None before any run)."""
+        if self._df is None and self._series is not None:
+            self._df = self._build_df(self._series)
+        return self._df
+
+    def _build_df(self, series: Dict[str, np.ndarray]) -> pd.DataFrame:
+        months = self.total_months
+
+        # "MS" generates month starts directly; other start days need DateOffset's end-of-month clamping
+        start = pd.Timestamp(self.start_date)
+        step = "MS" if start.is_month_start else pd.DateOffset(months=1)
+        dates = pd.date_range(start, periods=months, freq=step)
+
+        df = pd.DataFrame({
+            "date": dates,
+            "month_index": np.arange(months),
+            "effective_rent": series["effective_rent"],
+            "expenses": series["expenses"],
+            "mortgage_payment": series["mortgage_payment"],
+            "interest": series["interest"],
+            "principal": series["principal"],
+            "balance": series["balance"],
+            "monthly_cash_flow": series["monthly_cash_flow"],
+            "cumulative_cash_flow": series["cumulative_cash_flow"],
+            "property_value": series["property_value"],
+        })
         return df
 
+    def run(self) -> pd.DataFrame:
+        self._simulate()
+        return self.df
+
+    def run_kpis_only(self) -> Dict[str, Any]:
+        """
+        Run the simulation without building the monthly DataFrame; self.df builds it only
+        if it is accessed afterwards.
+
+        Returns:
+            dict with the first month's effective_rent, expenses, mortgage_payment and
+            monthly_cash_flow, followed by the KPIs (also stored in self.results)
+        """
+        series = self._simulate()
+        return {
+            "effective_rent": float(series["effective_rent"][0]),
+            "expenses": float(series["expenses"][0]),
+            "mortgage_payment": float(series["mortgage_payment"][0]),
+            "monthly_cash_flow": float(series["monthly_cash_flow"][0]),
+            **self.results,
+        }
+
     def kpis(self) -> Dict[str, Any]:
         if not self.results:
             self.run()
@@ -1,10 +1,23 @@
 
 import sqlite3
 import json
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import threading
+import atexit
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import msgpack
+except ImportError:  # listed in requirements.txt; only needed to store or read scenario params
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; legacy JSON params are then parsed by the stdlib json module
+    orjson = None
+
 DEFAULT_DB = str(Path(__file__).resolve().parent / "simdb.sqlite")
 
 SCHEMA = """
@@ -35,6 +48,7 @@ CREATE TABLE IF NOT EXISTS scenarios (
     id INTEGER PRIMARY KEY,
     property_id INTEGER NOT NULL,
     name TEXT NOT NULL,
+    -- Despite the name and TEXT affinity: version-tagged msgpack BLOBs (legacy rows: JSON text)
     params_json TEXT NOT NULL,
     created_at TEXT,
     updated_at TEXT,
@@ -56,21 +70,90 @@ CREATE TABLE IF NOT EXISTS runs (
     csv_path TEXT,
     FOREIGN KEY(scenario_id) REFERENCES scenarios(id) ON DELETE CASCADE
 );
+
+CREATE INDEX IF NOT EXISTS idx_scenarios_property ON scenarios(property_id);
+-- Serves the run history query (newest id first within a scenario) without a sort step
+DROP INDEX IF EXISTS idx_runs_scenario;
+CREATE INDEX IF NOT EXISTS idx_runs_scenario_id ON runs(scenario_id, id DESC);
 """
 
-def connect(db_path: str = DEFAULT_DB):
-    conn = sqlite3.connect(db_path)
+# Connections are pooled per database path and checked out for the duration of a call.
+# Streamlit runs every rerun in a fresh ScriptRunner thread, so per-thread connections would
+# be reopened (and re-configured) on each interaction; pooled ones are reused across reruns
+# and sessions, and a checked-out connection is only ever used by one thread at a time.
+_POOL_MAX_IDLE = 4
+_pools: Dict[str, List[sqlite3.Connection]] = {}
+_pool_lock = threading.Lock()
+# Connection currently checked out by this thread, per path, so nested calls share it
+_checked_out = threading.local()
+
+def connect(db_path: str = DEFAULT_DB, check_same_thread: bool = True):
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     return conn
 
-def init_db(db_path: str = DEFAULT_DB) -> None:
-    conn = connect(db_path)
+def _open_pooled(db_path: str) -> sqlite3.Connection:
+    conn = connect(db_path, check_same_thread=False)
+    # Per-connection settings; WAL itself is persistent and switched on once in init_db.
+    # NORMAL drops the per-commit fsync of the WAL; busy_timeout makes concurrent writers
+    # on other connections wait for the lock instead of failing with "database is locked"
+    conn.execute("PRAGMA busy_timeout = 10000;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    return conn
+
+@contextmanager
+def get_conn(db_path: str = DEFAULT_DB) -> Iterator[sqlite3.Connection]:
+    """
+    Check out a pooled connection for db_path for the duration of the with-block.
+    Nested checkouts on the same thread get the same connection, so helpers called inside
+    a caller's transaction take part in it. Callers must not close the connection.
+    """
+    held = getattr(_checked_out, "conns", None)
+    if held is None:
+        held = _checked_out.conns = {}
+    if db_path in held:
+        yield held[db_path]
+        return
+
+    with _pool_lock:
+        idle = _pools.setdefault(db_path, [])
+        conn = idle.pop() if idle else None
+    if conn is None:
+        conn = _open_pooled(db_path)
+    held[db_path] = conn
     try:
-        conn.executescript(SCHEMA)
-        _ensure_purchase_columns(conn)
-        conn.commit()
+        yield conn
     finally:
-        conn.close()
+        del held[db_path]
+        if conn.in_transaction:
+            # Never hand a half-finished transaction to the next user
+            conn.rollback()
+        with _pool_lock:
+            idle = _pools.setdefault(db_path, [])
+            if len(idle) < _POOL_MAX_IDLE:
+                idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+@atexit.register
+def close_pooled_connections() -> None:
+    """Close every idle pooled connection."""
+    with _pool_lock:
+        for idle in _pools.values():
+            while idle:
+                idle.pop().close()
+
+def init_db(db_path: str = DEFAULT_DB) -> None:
+    with get_conn(db_path) as conn:
+        # WAL lets reads proceed during writes; the mode is stored in the database file
+        conn.execute("PRAGMA journal_mode = WAL;")
+        with conn:
+            conn.executescript(SCHEMA)
+            _ensure_purchase_columns(conn)
 
 
 def _ensure_purchase_columns(conn: sqlite3.Connection) -> None:
@@ -89,13 +172,39 @@ def _ensure_purchase_columns(conn: sqlite3.Connection) -> None:
         if name not in existing:
             conn.execute(f"ALTER TABLE properties ADD COLUMN {name} {coltype}")
 
+# Version byte prefixed to msgpack-encoded scenario params; untagged rows are legacy JSON text.
+# SQLite stores the bytes as a BLOB in the TEXT-declared params_json column (no affinity conversion)
+PARAMS_MSGPACK_V1 = b"\x01"
+
+def _encode_params(params: Dict[str, Any]) -> bytes:
+    # The only write format; JSON text is read for legacy rows but never written
+    if msgpack is None:
+        raise RuntimeError(
+            "Saving scenario params requires the msgpack package; "
+            "install the requirements (pip install -r requirements.txt)"
+        )
+    return PARAMS_MSGPACK_V1 + msgpack.packb(params, use_bin_type=True)
+
+def _decode_params(raw) -> Dict[str, Any]:
+    if raw is None:
+        return {}
+    if isinstance(raw, bytes) and raw[:1] == PARAMS_MSGPACK_V1:
+        if msgpack is None:
+            raise RuntimeError(
+                "Scenario params are stored as msgpack but the msgpack package is not installed; "
+                "install the requirements (pip install -r requirements.txt)"
+            )
+        return msgpack.unpackb(raw[1:], raw=False)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 def now() -> str:
-    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 # -------- properties --------
 def list_properties(db_path: str = DEFAULT_DB) -> List[Dict[str, Any]]:
-    conn = connect(db_path)
-    try:
+    with get_conn(db_path) as conn:
         cur = conn.execute("""
             SELECT id, address, mls_number, latitude, longitude, beds, baths, sqft, year_built, notes,
                    purchase_price, down_payment_percent, annual_interest_percent, amort_years,
@@ -103,65 +212,54 @@ def list_properties(db_path: str = DEFAULT_DB) -> List[Dict[str, Any]]:
             FROM properties
             ORDER BY created_at DESC
         """)
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
-    finally:
-        conn.close()
+        return [dict(row) for row in cur.fetchall()]
 
 def upsert_property(prop: Dict[str, Any], db_path: str = DEFAULT_DB) -> int:
     """
     Insert or update a property. If 'id' in prop, update, else insert.
     Returns the id.
     """
-    conn = connect(db_path)
-    try:
-        ts = now()
-        if prop.get("id"):
-            conn.execute("""
-                UPDATE properties
-                SET address=?, mls_number=?, latitude=?, longitude=?, beds=?, baths=?, sqft=?, year_built=?, notes=?,
-                    purchase_price=?, down_payment_percent=?, annual_interest_percent=?, amort_years=?,
-                    closing_costs_percent_of_price=?, map_image_path=?, updated_at=?
-                WHERE id=?
-            """, (
-                prop.get("address"), prop.get("mls_number"), prop.get("latitude"), prop.get("longitude"),
-                prop.get("beds"), prop.get("baths"), prop.get("sqft"), prop.get("year_built"), prop.get("notes"),
-                prop.get("purchase_price"), prop.get("down_payment_percent"), prop.get("annual_interest_percent"),
-                prop.get("amort_years"), prop.get("closing_costs_percent_of_price"), prop.get("map_image_path"), ts, prop["id"]
-            ))
-            conn.commit()
-            return int(prop["id"])
-        else:
-            cur = conn.execute("""
-                INSERT INTO properties (
-                    address, mls_number, latitude, longitude, beds, baths, sqft, year_built, notes,
-                    purchase_price, down_payment_percent, annual_interest_percent, amort_years,
-                    closing_costs_percent_of_price, map_image_path, created_at, updated_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                prop.get("address"), prop.get("mls_number"), prop.get("latitude"), prop.get("longitude"),
-                prop.get("beds"), prop.get("baths"), prop.get("sqft"), prop.get("year_built"), prop.get("notes"),
-                prop.get("purchase_price"), prop.get("down_payment_percent"), prop.get("annual_interest_percent"),
-                prop.get("amort_years"), prop.get("closing_costs_percent_of_price"), prop.get("map_image_path"), ts, ts
-            ))
-            conn.commit()
-            return int(cur.lastrowid)
-    finally:
-        conn.close()
+    with get_conn(db_path) as conn:
+        with conn:
+            ts = now()
+            if prop.get("id"):
+                conn.execute("""
+                    UPDATE properties
+                    SET address=?, mls_number=?, latitude=?, longitude=?, beds=?, baths=?, sqft=?, year_built=?, notes=?,
+                        purchase_price=?, down_payment_percent=?, annual_interest_percent=?, amort_years=?,
+                        closing_costs_percent_of_price=?, map_image_path=?, updated_at=?
+                    WHERE id=?
+                """, (
+                    prop.get("address"), prop.get("mls_number"), prop.get("latitude"), prop.get("longitude"),
+                    prop.get("beds"), prop.get("baths"), prop.get("sqft"), prop.get("year_built"), prop.get("notes"),
+                    prop.get("purchase_price"), prop.get("down_payment_percent"), prop.get("annual_interest_percent"),
+                    prop.get("amort_years"), prop.get("closing_costs_percent_of_price"), prop.get("map_image_path"), ts, prop["id"]
+                ))
+                return int(prop["id"])
+            else:
+                cur = conn.execute("""
+                    INSERT INTO properties (
+                        address, mls_number, latitude, longitude, beds, baths, sqft, year_built, notes,
+                        purchase_price, down_payment_percent, annual_interest_percent, amort_years,
+                        closing_costs_percent_of_price, map_image_path, created_at, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    prop.get("address"), prop.get("mls_number"), prop.get("latitude"), prop.get("longitude"),
+                    prop.get("beds"), prop.get("baths"), prop.get("sqft"), prop.get("year_built"), prop.get("notes"),
+                    prop.get("purchase_price"), prop.get("down_payment_percent"), prop.get("annual_interest_percent"),
+                    prop.get("amort_years"), prop.get("closing_costs_percent_of_price"), prop.get("map_image_path"), ts, ts
+                ))
+                return int(cur.lastrowid)
 
 def delete_property(prop_id: int, db_path: str = DEFAULT_DB) -> None:
-    conn = connect(db_path)
-    try:
-        conn.execute("DELETE FROM properties WHERE id=?", (prop_id,))
-        conn.commit()
-    finally:
-        conn.close()
+    with get_conn(db_path) as conn:
+        with conn:
+            conn.execute("DELETE FROM properties WHERE id=?", (prop_id,))
 
 
 def get_property(prop_id: int, db_path: str = DEFAULT_DB) -> Optional[Dict[str, Any]]:
-    conn = connect(db_path)
-    try:
+    with get_conn(db_path) as conn:
         cur = conn.execute(
             """
             SELECT id, address, mls_number, latitude, longitude, beds, baths, sqft, year_built, notes,
@@ -175,35 +273,24 @@ def get_property(prop_id: int, db_path: str = DEFAULT_DB) -> Optional[Dict[str,
         row = cur.fetchone()
         if not row:
             return None
-        cols = [c[0] for c in cur.description]
-        return dict(zip(cols, row))
-    finally:
-        conn.close()
+        return dict(row)
 
 # -------- scenarios --------
 def list_scenarios(property_id: int, db_path: str = DEFAULT_DB) -> List[Dict[str, Any]]:
-    conn = connect(db_path)
-    try:
+    with get_conn(db_path) as conn:
         cur = conn.execute("""
             SELECT id, property_id, name, params_json, created_at, updated_at
             FROM scenarios
             WHERE property_id=?
             ORDER BY updated_at DESC, created_at DESC
         """, (property_id,))
-        cols = [c[0] for c in cur.description]
-        rows = [dict(zip(cols, row)) for row in cur.fetchall()]
+        rows = [dict(row) for row in cur.fetchall()]
         for r in rows:
-            try:
-                r["params"] = json.loads(r["params_json"])
-            except Exception:
-                r["params"] = {}
+            r["params"] = _decode_params(r["params_json"])
         return rows
-    finally:
-        conn.close()
 
 def get_scenario(scenario_id: int, db_path: str = DEFAULT_DB) -> Optional[Dict[str, Any]]:
-    conn = connect(db_path)
-    try:
+    with get_conn(db_path) as conn:
         cur = conn.execute("""
             SELECT id, property_id, name, params_json, created_at, updated_at
             FROM scenarios
@@ -212,78 +299,102 @@ def get_scenario(scenario_id: int, db_path: str = DEFAULT_DB) -> Optional[Dict[s
         row = cur.fetchone()
         if not row:
             return None
-        cols = [c[0] for c in cur.description]
-        rec = dict(zip(cols, row))
-        try:
-            rec["params"] = json.loads(rec["params_json"])
-        except Exception:
-            rec["params"] = {}
+        rec = dict(row)
+        rec["params"] = _decode_params(rec["params_json"])
         return rec
-    finally:
-        conn.close()
 
 def create_scenario(property_id: int, name: str, params: Dict[str, Any], db_path: str = DEFAULT_DB) -> int:
-    conn = connect(db_path)
-    try:
-        ts = now()
-        cur = conn.execute("""
-            INSERT INTO scenarios (property_id, name, params_json, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (property_id, name, json.dumps(params), ts, ts))
-        conn.commit()
-        return int(cur.lastrowid)
-    finally:
-        conn.close()
+    with get_conn(db_path) as conn:
+        with conn:
+            ts = now()
+            cur = conn.execute("""
+                INSERT INTO scenarios (property_id, name, params_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (property_id, name, _encode_params(params), ts, ts))
+            return int(cur.lastrowid)
 
 def update_scenario(scenario_id: int, name: str, params: Dict[str, Any], db_path: str = DEFAULT_DB) -> None:
-    conn = connect(db_path)
-    try:
-        ts = now()
-        conn.execute("""
-            UPDATE scenarios
-            SET name=?, params_json=?, updated_at=?
-            WHERE id=?
-        """, (name, json.dumps(params), ts, scenario_id))
-        conn.commit()
-    finally:
-        conn.close()
+    with get_conn(db_path) as conn:
+        with conn:
+            ts = now()
+            conn.execute("""
+                UPDATE scenarios
+                SET name=?, params_json=?, updated_at=?
+                WHERE id=?
+            """, (name, _encode_params(params), ts, scenario_id))
 
 def delete_scenario(scenario_id: int, db_path: str = DEFAULT_DB) -> None:
-    conn = connect(db_path)
-    try:
-        conn.execute("DELETE FROM scenarios WHERE id=?", (scenario_id,))
-        conn.commit()
-    finally:
-        conn.close()
+    with get_conn(db_path) as conn:
+        with conn:
+            conn.execute("DELETE FROM scenarios WHERE id=?", (scenario_id,))
 
 # -------- runs --------
+_INSERT_RUN_SQL = """
+    INSERT INTO runs (scenario_id, run_at, monthly_mortgage, initial_coc, ending_monthly_cf,
+                      cumulative_cf, terminal_equity, total_invested_est, total_return_est, payback_month, csv_path)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _run_row(scenario_id: int, kpis: Dict[str, Any], csv_path: Optional[str], run_at: str) -> tuple:
+    return (
+        scenario_id, run_at,
+        float(kpis.get("monthly_mortgage", 0.0)),
+        float(kpis.get("initial_cash_on_cash_percent", 0.0)),
+        float(kpis.get("ending_monthly_cash_flow", 0.0)),
+        float(kpis.get("cumulative_cash_flow", 0.0)),
+        float(kpis.get("terminal_equity", 0.0)),
+        float(kpis.get("total_invested_est", 0.0)),
+        float(kpis.get("total_return_est", 0.0)),
+        int(kpis.get("payback_month_on_upfront", -1)) if kpis.get("payback_month_on_upfront") is not None else None,
+        csv_path
+    )
+
 def add_run(scenario_id: int, kpis: Dict[str, Any], csv_path: Optional[str], db_path: str = DEFAULT_DB) -> int:
-    conn = connect(db_path)
-    try:
-        cur = conn.execute("""
-            INSERT INTO runs (scenario_id, run_at, monthly_mortgage, initial_coc, ending_monthly_cf,
-                              cumulative_cf, terminal_equity, total_invested_est, total_return_est, payback_month, csv_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            scenario_id, now(), 
-            float(kpis.get("monthly_mortgage", 0.0)),
-            float(kpis.get("initial_cash_on_cash_percent", 0.0)),
-            float(kpis.get("ending_monthly_cash_flow", 0.0)),
-            float(kpis.get("cumulative_cash_flow", 0.0)),
-            float(kpis.get("terminal_equity", 0.0)),
-            float(kpis.get("total_invested_est", 0.0)),
-            float(kpis.get("total_return_est", 0.0)),
-            int(kpis.get("payback_month_on_upfront", -1)) if kpis.get("payback_month_on_upfront") is not None else None,
-            csv_path
-        ))
-        conn.commit()
-        return int(cur.lastrowid)
-    finally:
-        conn.close()
+    with get_conn(db_path) as conn:
+        with conn:
+            cur = conn.execute(_INSERT_RUN_SQL, _run_row(scenario_id, kpis, csv_path, now()))
+            return int(cur.lastrowid)
+
+def add_runs(
+    scenario_id: int,
+    kpis_list: List[Dict[str, Any]],
+    csv_paths: Optional[List[Optional[str]]] = None,
+    db_path: str = DEFAULT_DB,
+) -> int:
+    """
+    Insert several runs of a scenario (e.g. every point of a sweep) with one executemany,
+    all or nothing. On its own it runs in one transaction and commits; inside a caller's
+    transaction it uses a savepoint and does not commit. All rows share one run_at timestamp.
+    Returns the number of rows inserted.
+    """
+    if csv_paths is None:
+        csv_paths = [None] * len(kpis_list)
+    elif len(csv_paths) != len(kpis_list):
+        raise ValueError(f"got {len(kpis_list)} KPI dicts but {len(csv_paths)} CSV paths")
+    run_at = now()
+    rows = [_run_row(scenario_id, kpis, csv_path, run_at) for kpis, csv_path in zip(kpis_list, csv_paths)]
+    with get_conn(db_path) as conn:
+        if conn.in_transaction:
+            # Inside a caller's transaction: a savepoint keeps the batch all-or-nothing and
+            # leaves commit/rollback of the surrounding transaction to the caller
+            conn.execute("SAVEPOINT add_runs")
+            try:
+                conn.executemany(_INSERT_RUN_SQL, rows)
+            except Exception:
+                conn.execute("ROLLBACK TO add_runs")
+                raise
+            finally:
+                conn.execute("RELEASE add_runs")
+        else:
+            with conn:
+                # Take the write lock before the first insert: writers on other connections
+                # wait (busy_timeout) until this batch commits, and a failing row rolls back all of it
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_INSERT_RUN_SQL, rows)
+        return len(rows)
 
 def list_runs(scenario_id: int, db_path: str = DEFAULT_DB) -> list:
-    conn = connect(db_path)
-    try:
+    with get_conn(db_path) as conn:
         cur = conn.execute("""
             SELECT id, scenario_id, run_at, monthly_mortgage, initial_coc, ending_monthly_cf,
                    cumulative_cf, terminal_equity, total_invested_est, total_return_est, payback_month, csv_path
@@ -291,17 +402,72 @@ def list_runs(scenario_id: int, db_path: str = DEFAULT_DB) -> list:
             WHERE scenario_id=?
             ORDER BY run_at DESC
         """, (scenario_id,))
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
-    finally:
-        conn.close()
+        return [dict(row) for row in cur.fetchall()]
 
 
+RUN_SUMMARY_COLUMNS = (
+    "id", "run_at", "monthly_mortgage", "initial_coc", "ending_monthly_cf", "cumulative_cf",
+    "terminal_equity", "total_invested_est", "total_return_est", "payback_month", "csv_path",
+)
+
+
+def list_runs_summary(scenario_id: int, db_path: str = DEFAULT_DB, limit: int = 100) -> List[tuple]:
+    """
+    Latest runs for a scenario as plain tuples ordered like RUN_SUMMARY_COLUMNS.
+    Only the columns the history table shows are read.
+    """
+    # Plain tuples: sqlite3.Row does not pickle, and the result is cached by the app
+    with get_conn(db_path) as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(f"""
+            SELECT {", ".join(RUN_SUMMARY_COLUMNS)}
+            FROM runs
+            WHERE scenario_id=?
+            ORDER BY id DESC
+            LIMIT ?
+        """, (scenario_id, limit))
+        return cur.fetchall()
+
+
+def load_sidebar_state(
+    db_path: str = DEFAULT_DB,
+    property_id: Optional[int] = None,
+    scenario_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Load what the simulator page shows in a single read transaction.
+    Returns a dict with properties, scenarios (for property_id), current_scenario and its run summaries.
+    """
+    with get_conn(db_path) as conn:
+        # Inside a caller's transaction, read within it and leave commit/rollback to the caller
+        owns_transaction = not conn.in_transaction
+        if owns_transaction:
+            conn.execute("BEGIN")
+        try:
+            properties = list_properties(db_path)
+            scenarios = list_scenarios(property_id, db_path) if property_id is not None else []
+            current_scenario = None
+            if scenario_id is not None:
+                current_scenario = next((s for s in scenarios if s["id"] == scenario_id), None)
+                if current_scenario is None:
+                    current_scenario = get_scenario(scenario_id, db_path)
+            runs = list_runs_summary(scenario_id, db_path) if current_scenario is not None else []
+        finally:
+            if owns_transaction:
+                # Read-only: ending the transaction just releases the snapshot
+                conn.rollback()
+        return {
+            "properties": properties,
+            "scenarios": scenarios,
+            "current_scenario": current_scenario,
+            "runs": runs,
+        }
+
 def list_properties_with_latest_run(db_path: str = DEFAULT_DB) -> List[Dict[str, Any]]:
     """Return properties that have at least one simulation run with the latest run metrics."""
 
-    conn = connect(db_path)
-    try:
+    with get_conn(db_path) as conn:
         cur = conn.execute(
             """
             SELECT
@@ -350,7 +516,4 @@ def list_properties_with_latest_run(db_path: str = DEFAULT_DB) -> List[Dict[str,
             ORDER BY r.run_at DESC, r.id DESC
         """
         )
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
-    finally:
-        conn.close()
+        return [dict(row) for row in cur.fetchall()]